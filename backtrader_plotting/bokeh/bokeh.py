@@ -1,5 +1,5 @@
-from array import array
 import bisect
+from collections import defaultdict
 import datetime
 import itertools
 import logging
@@ -11,6 +11,8 @@ from typing import List, Dict, Optional, Union, Tuple
 
 import backtrader as bt
 
+import numpy
+
 from bokeh.models import ColumnDataSource, Model
 from bokeh.models.widgets import Panel, Tabs
 from bokeh.layouts import column, gridplot
@@ -20,11 +22,9 @@ from bokeh.models.widgets import Div
 from bokeh.resources import CDN
 from bokeh.util.browser import view
 
-from jinja2 import Environment, PackageLoader
-
-from backtrader_plotting.bokeh.utils import generate_stylesheet
+from backtrader_plotting.bokeh.utils import generate_stylesheet, get_stylesheet_variables, get_template
 from backtrader_plotting.bokeh import label_resolver
-from backtrader_plotting.utils import find_by_plotid
+from backtrader_plotting.utils import find_by_plotid, convert_to_datetime64
 from backtrader_plotting.bokeh.figure import Figure, HoverContainer
 from backtrader_plotting.bokeh.datatable import TableGenerator
 from backtrader_plotting.schemes import Blackly
@@ -70,6 +70,7 @@ class Bokeh(metaclass=bt.MetaParams):
         self._is_optreturn: bool = False  # when optreturn is active during optimization then we get a thinned out result only
         self._current_fig_idx: Optional[int] = None
         self._figurepages: List[FigurePage] = []
+        self._css_cache: Dict[Tuple, str] = {}  # rendered stylesheets keyed by template and the scheme values they use
 
     def _configure_plotting(self, strategy: bt.Strategy):
         datas, inds, obs = strategy.datas, strategy.getindicators(), strategy.getobservers()
@@ -124,8 +125,10 @@ class Bokeh(metaclass=bt.MetaParams):
                 raise RuntimeError(f'Unknown config type in plotting config: {k}')
 
     def _build_graph(self, datas, inds, obs) -> Tuple[Dict, List]:
-        data_graph = {}
+        data_graph = defaultdict(list)
         volume_graph = []
+        # volume gets its own figures only if it is not overlayed
+        want_volume = self.p.scheme.volume and self.p.scheme.voloverlay is False
         for d in datas:
             if not d.plotinfo.plot:
                 continue
@@ -134,11 +137,9 @@ class Bokeh(metaclass=bt.MetaParams):
             if pmaster is None:
                 data_graph[d] = []
             else:
-                if pmaster not in data_graph:
-                    data_graph[pmaster] = []
                 data_graph[pmaster].append(d)
 
-            if self.p.scheme.volume and self.p.scheme.voloverlay is False:
+            if want_volume:
                 volume_graph.append(d)
 
         for obj in itertools.chain(inds, obs):
@@ -157,11 +158,10 @@ class Bokeh(metaclass=bt.MetaParams):
                 data_graph[obj] = []
             else:
                 plotmaster = plotmaster if plotmaster is not None else obj.data
-                if plotmaster not in data_graph:
-                    data_graph[plotmaster] = []
                 data_graph[plotmaster].append(obj)
 
-        return data_graph, volume_graph
+        # hand out a plain dict so later lookups cannot silently add masters
+        return dict(data_graph), volume_graph
 
     @property
     def _figurepage(self) -> FigurePage:
@@ -181,13 +181,17 @@ class Bokeh(metaclass=bt.MetaParams):
         return obj
 
     @staticmethod
-    def _get_start_end(strategy, start, end):
-        st_dtime = strategy.lines.datetime.array
+    def _get_start_end(strategy, start, end, st_dtime=None):
+        """Resolves start and end (None, date or negative index) to indices of the strategy's clock.
+        The clock's underlying array is used as it has the same length as plot() but avoids creating a copy"""
+        if st_dtime is None:
+            st_dtime = strategy.lines.datetime.array
         if start is None:
             start = 0
         if end is None:
             end = len(st_dtime)
 
+        # bisect works directly on the clock's array('d') in C. For single lookups this is faster than going through numpy
         if isinstance(start, datetime.date):
             start = bisect.bisect_left(st_dtime, bt.date2num(start))
 
@@ -195,7 +199,7 @@ class Bokeh(metaclass=bt.MetaParams):
             end = bisect.bisect_right(st_dtime, bt.date2num(end))
 
         if end < 0:
-            end = len(st_dtime) + 1 + end
+            end = len(st_dtime) + 1 + end  # -1 =  len() -2 = len() - 1
 
         return start, end
 
@@ -208,35 +212,21 @@ class Bokeh(metaclass=bt.MetaParams):
 
         self._figurepage.analyzers += [a for _, a in strategy.analyzers.getitems()]
 
-        st_dtime = strategy.lines.datetime.plot()
-        if start is None:
-            start = 0
-        if end is None:
-            end = len(st_dtime)
-
-        if isinstance(start, datetime.date):
-            start = bisect.bisect_left(st_dtime, bt.date2num(start))
-
-        if isinstance(end, datetime.date):
-            end = bisect.bisect_right(st_dtime, bt.date2num(end))
-
-        if end < 0:
-            end = len(st_dtime) + 1 + end  # -1 =  len() -2 = len() - 1
+        start, end = Bokeh._get_start_end(strategy, start, end)
 
-        strat_clk: array[float] = strategy.lines.datetime.plotrange(start, end)
+        # zero-copy view on the clock array so downstream code can work vectorized
+        strat_clk: numpy.ndarray = numpy.frombuffer(strategy.lines.datetime.plotrange(start, end))
 
         if self._figurepage.cds is None:
             # we use timezone of first data
-            dtline = [bt.num2date(x, strategy.datas[0]._tz) for x in strat_clk]
+            dtline = convert_to_datetime64(strat_clk, strategy.datas[0]._tz)
 
             # add an index line to use as x-axis (instead of datetime axis) to avoid datetime gaps (e.g. weekends)
-            indices = list(range(0, len(dtline)))
+            indices = numpy.arange(len(dtline), dtype=numpy.int32)
             self._figurepage.cds = ColumnDataSource(data=dict(datetime=dtline, index=indices))
 
         data_graph, volume_graph = self._build_graph(strategy.datas, strategy.getindicators(), strategy.getobservers())
 
-        start, end = Bokeh._get_start_end(strategy, start, end)
-
         # reset hover container to not mix hovers with other strategies
         hoverc = HoverContainer(hover_tooltip_config=self.p.scheme.hover_tooltip_config, is_multidata=len(strategy.datas) > 1)
 
@@ -251,21 +241,20 @@ class Bokeh(metaclass=bt.MetaParams):
                 figure.plot(s, strat_clk, master)
             strat_figures.append(figure)
 
-        for f in strat_figures:
+        for i, f in enumerate(strat_figures):
             f.figure.legend.click_policy = self.p.scheme.legend_click
             f.figure.legend.location = self.p.scheme.legend_location
             f.figure.legend.background_fill_color = self.p.scheme.legend_background_color
             f.figure.legend.label_text_color = self.p.scheme.legend_text_color
             f.figure.legend.orientation = self.p.scheme.legend_orientation
 
-        # link axis
-        for i in range(1, len(strat_figures)):
-            strat_figures[i].figure.x_range = strat_figures[0].figure.x_range
+            # link axis
+            if i > 0:
+                f.figure.x_range = strat_figures[0].figure.x_range
 
-        # configure xaxis visibility
-        if self.p.scheme.xaxis_pos == "bottom":
-            for i, f in enumerate(strat_figures):
-                f.figure.xaxis.visible = False if i <= len(strat_figures) else True
+            # configure xaxis visibility: only the last figure keeps it
+            if self.p.scheme.xaxis_pos == "bottom" and i < len(strat_figures) - 1:
+                f.figure.xaxis.visible = False
 
         hoverc.apply_hovertips(strat_figures)
 
@@ -336,9 +325,16 @@ class Bokeh(metaclass=bt.MetaParams):
             raise RuntimeError(f'Invalid tabs parameter "{self.p.scheme.tabs}"')
 
     def _generate_model_tabs(self, fp: FigurePage) -> List[Panel]:
-        observers = [x for x in fp.figures if isinstance(x.master, bt.Observer)]
-        datas = [x for x in fp.figures if isinstance(x.master, bt.DataBase)]
-        inds = [x for x in fp.figures if isinstance(x.master, bt.Indicator)]
+        # classify figures in a single pass, preserving their order
+        observers, datas, inds = [], [], []
+        for x in fp.figures:
+            master_type = type(x.master)
+            if issubclass(master_type, bt.Observer):
+                observers.append(x)
+            elif issubclass(master_type, bt.DataBase):
+                datas.append(x)
+            elif issubclass(master_type, bt.Indicator):
+                inds.append(x)
 
         tabs = []
 
@@ -379,9 +375,6 @@ class Bokeh(metaclass=bt.MetaParams):
     # endregion
 
     def _get_analyzer_panel(self, analyzers: List[bt.Analyzer]) -> Optional[Panel]:
-        def _get_column_row_count(col) -> int:
-            return sum([x.height for x in col if x.height is not None])
-
         if len(analyzers) == 0:
             return None
 
@@ -397,16 +390,20 @@ class Bokeh(metaclass=bt.MetaParams):
         return Panel(child=childs, title='Analyzers')
 
     def _output_stylesheet(self, template="basic.css.j2"):
-        return generate_stylesheet(self.p.scheme, template)
+        # the scheme is mutable so key on the values the stylesheet is rendered with rather than on the scheme object
+        key = (template, tuple(get_stylesheet_variables(self.p.scheme).items()))
+        css = self._css_cache.get(key)
+        if css is None:
+            css = generate_stylesheet(self.p.scheme, template)
+            self._css_cache[key] = css
+        return css
 
     def _output_plot_file(self, model, idx, filename=None, template="basic.html.j2"):
         if filename is None:
             tmpdir = tempfile.gettempdir()
             filename = os.path.join(tmpdir, f"bt_bokeh_plot_{idx}.html")
 
-        env = Environment(loader=PackageLoader('backtrader_plotting.bokeh', 'templates'))
-        templ = env.get_template(template)
-        templ.globals['now'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        templ = get_template(template)
 
         html = file_html(model,
                          template=templ,
@@ -414,11 +411,24 @@ class Bokeh(metaclass=bt.MetaParams):
                          template_variables=dict(
                              stylesheet=self._output_stylesheet(),
                              show_headline=self.p.scheme.show_headline,
+                             now=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                              )
                          )
 
-        with open(filename, 'w') as f:
-            f.write(html)
+        # write in chunks so that the encoded copy of a potentially huge page is never held in memory as a whole.
+        # The page is written to a temporary file first so a browser opening it never sees a partially written file
+        chunk_size = 1 << 20
+        tmp_filename = filename + '.tmp'
+        try:
+            with open(tmp_filename, 'w', buffering=chunk_size, encoding='utf-8') as f:
+                for i in range(0, len(html), chunk_size):
+                    f.write(html[i:i + chunk_size])
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            # do not leave a partially written file behind
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
 
         return filename
 
@@ -432,9 +442,10 @@ class Bokeh(metaclass=bt.MetaParams):
         # prepare new FigurePage
         self._figurepages.append(FigurePage(obj))
         self._current_fig_idx = len(self._figurepages) - 1
+        is_strategy = isinstance(obj, bt.Strategy)
         self._is_optreturn = isinstance(obj, bt.OptReturn)
 
-        if isinstance(obj, bt.Strategy):
+        if is_strategy:
             # only configure plotting for regular backtesting (not for optimization)
             self._configure_plotting(obj)
 
@@ -445,9 +456,9 @@ class Bokeh(metaclass=bt.MetaParams):
 
         self._iplot = iplot and 'ipykernel' in sys.modules
 
-        if isinstance(obj, bt.Strategy):
+        if is_strategy:
             self._blueprint_strategy(obj, start, end, **kwargs)
-        elif isinstance(obj, bt.OptReturn):
+        elif self._is_optreturn:
             # for optresults we only plot analyzers!
             self._figurepage.analyzers += [a for _, a in obj.analyzers.getitems()]
         else:
@@ -475,6 +486,8 @@ class Bokeh(metaclass=bt.MetaParams):
                 raise RuntimeError(f'Invalid parameter "output_mode" with value: {self.p.output_mode}')
 
         self._reset()
+        # analyzer tables are not needed anymore. Browsed optimization results (which never get here) keep them cached
+        self._tablegen.clear_cache()
     #  endregion
 
     def _reset(self):
@@ -1,5 +1,5 @@
 from collections import OrderedDict
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from enum import Enum
 
 import backtrader as bt
@@ -21,6 +21,7 @@ class TableGenerator(object):
     def __init__(self, scheme, cerebro: bt.Cerebro=None):
         self._scheme = scheme
         self._cerebtro: bt.Cerebro = cerebro
+        self._table_cache: Dict[int, Tuple[bt.analyzers.Analyzer, str, List]] = {}
 
     @staticmethod
     def _get_analysis_table_generic(analyzer: bt.analyzers.Analyzer) -> Tuple[object, List[object]]:
@@ -53,13 +54,27 @@ class TableGenerator(object):
         else:
             raise Exception(f"Unsupported ColumnDataType: '{ctype}'")
 
+    def _get_analysis_table(self, analyzer: bt.analyzers.Analyzer) -> Tuple[str, List]:
+        """Returns title and table columns of an analyzer. Only the data is cached as Bokeh models can not be shared between documents"""
+        cached = self._table_cache.get(id(analyzer))
+        if cached is None:
+            if hasattr(analyzer, 'get_analysis_table'):
+                title, table_columns_list = analyzer.get_analysis_table()
+            else:
+                # Analyzer does not provide a table function. Use our generic one
+                title, table_columns_list = TableGenerator._get_analysis_table_generic(analyzer)
+
+            # keep a reference to the analyzer so its id can not be reused while cached
+            cached = (analyzer, title, table_columns_list)
+            self._table_cache[id(analyzer)] = cached
+        return cached[1], cached[2]
+
+    def clear_cache(self):
+        self._table_cache = {}
+
     def get_analyzers_tables(self, analyzer: bt.analyzers.Analyzer, table_width) -> (Paragraph, List[DataTable]):
         """Return a header for this analyzer and one *or more* data tables."""
-        if hasattr(analyzer, 'get_analysis_table'):
-            title, table_columns_list = analyzer.get_analysis_table()
-        else:
-            # Analyzer does not provide a table function. Use our generic one
-            title, table_columns_list = TableGenerator._get_analysis_table_generic(analyzer)
+        title, table_columns_list = self._get_analysis_table(analyzer)
 
         param_str = get_params_str(analyzer.params)
         if len(param_str) > 0:
@@ -1,10 +1,11 @@
-from array import array
 import collections
 import itertools
 from typing import List, Optional, Union
 
 import backtrader as bt
 
+import numpy
+
 from bokeh.models import Span
 from bokeh.plotting import figure
 from bokeh.models import HoverTool, CrosshairTool
@@ -250,7 +251,7 @@ class Figure(object):
 
         self.datas.append(obj)
 
-    def plot_data(self, data: bt.AbstractDataBase, strat_clk: array = None):
+    def plot_data(self, data: bt.AbstractDataBase, strat_clk: numpy.ndarray = None):
         source_id = Figure._source_id(data)
         title = sanitize_source_name(label_resolver.datatarget2label([data]))
 
@@ -314,7 +315,7 @@ class Figure(object):
         if self._scheme.volume and self._scheme.voloverlay:
             self.plot_volume(data, strat_clk, self._scheme.voltrans, True)
 
-    def plot_volume(self, data: bt.AbstractDataBase, strat_clk: array, alpha, extra_axis=False):
+    def plot_volume(self, data: bt.AbstractDataBase, strat_clk: numpy.ndarray, alpha, extra_axis=False):
         """extra_axis displays a second axis (for overlay on data plotting)"""
         source_id = Figure._source_id(data)
 
@@ -363,10 +364,10 @@ class Figure(object):
     def plot_observer(self, obj, master):
         self._plot_indicator_observer(obj, master)
 
-    def plot_indicator(self, obj: Union[bt.Indicator, bt.Observer], master, strat_clk: array = None):
+    def plot_indicator(self, obj: Union[bt.Indicator, bt.Observer], master, strat_clk: numpy.ndarray = None):
         self._plot_indicator_observer(obj, master, strat_clk)
 
-    def _plot_indicator_observer(self, obj: Union[bt.Indicator, bt.Observer], master, strat_clk: array = None):
+    def _plot_indicator_observer(self, obj: Union[bt.Indicator, bt.Observer], master, strat_clk: numpy.ndarray = None):
         pl = plotobj2label(obj)
 
         self._figure_append_title(pl)
@@ -1,4 +1,3 @@
-from collections import defaultdict
 import sys
 from typing import Dict, Callable, Tuple
 
@@ -15,8 +14,6 @@ from bokeh.models.widgets import DataTable, TableColumn, NumberFormatter, String
 from backtrader_plotting import Bokeh
 from backtrader_plotting.bokeh import utils
 
-from jinja2 import Environment, PackageLoader
-
 
 class OptBrowser:
     def __init__(self, bokeh: Bokeh, optresults, usercolumns: Dict[str, Callable] = None, num_result_limit=None, sortcolumn=None, sortasc=True):
@@ -29,13 +26,15 @@ class OptBrowser:
 
     def start(self, ioloop=None):
         """Serves an optimization resulst as a Bokeh application running on a web server"""
+        # the stylesheet only depends on the scheme so it is rendered once for all documents
+        stylesheet = utils.generate_stylesheet(self._bokeh.params.scheme)
+
         def make_document(doc: Document):
             doc.title = "Backtrader Optimization Result"
 
-            env = Environment(loader=PackageLoader('backtrader_plotting.bokeh', 'templates'))
-            doc.template = env.get_template("basic.html.j2")
+            doc.template = utils.get_template("basic.html.j2")
 
-            doc.template_variables['stylesheet'] = utils.generate_stylesheet(self._bokeh.params.scheme)
+            doc.template_variables['stylesheet'] = stylesheet
 
             model = self._build_optresult_model()
             doc.add_root(model)
@@ -44,14 +43,13 @@ class OptBrowser:
 
     def _build_optresult_selector(self, optresults) -> Tuple[DataTable, ColumnDataSource]:
         # 1. build a dict with all params and all user columns
-        data_dict = defaultdict(list)
-        for optres in optresults:
-            for param_name, _ in optres[0].params._getitems():
-                param_val = optres[0].params._get(param_name)
-                data_dict[param_name].append(param_val)
+        data_dict = {}
+        if len(optresults) > 0:
+            for param_name, _ in optresults[0][0].params._getitems():
+                data_dict[param_name] = [optres[0].params._get(param_name) for optres in optresults]
 
-            for usercol_label, usercol_fnc in self._usercolumns.items():
-                data_dict[usercol_label].append(usercol_fnc(optres))
+        for usercol_label, usercol_fnc in self._usercolumns.items():
+            data_dict[usercol_label] = [usercol_fnc(optres) for optres in optresults]
 
         # 2. build a pandas DataFrame
         df = DataFrame(data_dict)
@@ -87,8 +85,13 @@ class OptBrowser:
 
         selector, selector_cds = self._build_optresult_selector(self._optresults)
 
-        def _get_model(idx: int):
-            return self._bokeh.plot_and_generate_optmodel(self._optresults[idx][0])
+        # models already built for this document are kept so selecting a result again does not rebuild it
+        models: Dict[int, Model] = {}
+
+        def _get_model(idx: int) -> Model:
+            if idx not in models:
+                models[idx] = self._bokeh.plot_and_generate_optmodel(self._optresults[idx][0])
+            return models[idx]
 
         #  first zero is because we show the first opt result by default and second zero cause we support only 1 strategy
         model = column([selector, _get_model(0)])
@@ -98,8 +101,11 @@ class OptBrowser:
             if len(new) == 0:
                 return
 
-            stratidx = new[0]
-            model.children[-1] = _get_model(stratidx)
+            # rows may be sorted and limited, so map the selected row back to the index of its result
+            stratidx = int(selector_cds.data['index'][new[0]])
+            stratmodel = _get_model(stratidx)
+            if model.children[-1] is not stratmodel:
+                model.children[-1] = stratmodel
 
         selector_cds.selected.on_change('indices', update)
 
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from jinja2 import Environment, PackageLoader
 
 import matplotlib.colors
@@ -5,6 +7,10 @@ import matplotlib.colors
 from backtrader_plotting.utils import nanfilt
 
 
+# shared environment so templates get compiled only once (Jinja caches them per environment)
+_jinja_env = Environment(loader=PackageLoader('backtrader_plotting.bokeh', 'templates'))
+
+
 def convert_color(color):
     """if color is a float value then it is interpreted as a shade of grey and converted to the corresponding html color code"""
     try:
@@ -61,24 +67,31 @@ def adapt_yranges(y_range, data_min, data_max=None):
     y_range.end = dmax
 
 
+def get_template(template: str):
+    """Returns the compiled template with the given name from the package's template directory"""
+    return _jinja_env.get_template(template)
+
+
+def get_stylesheet_variables(scheme) -> Dict[str, object]:
+    """Returns the scheme values the stylesheet template gets rendered with"""
+    return dict(datatable_row_color_even=scheme.table_color_even,
+                datatable_row_color_odd=scheme.table_color_odd,
+                datatable_header_color=scheme.table_header_color,
+                tab_active_background_color=scheme.tab_active_background_color,
+                tab_active_color=scheme.tab_active_color,
+
+                tooltip_background_color=scheme.tooltip_background_color,
+                tooltip_text_color_label=scheme.tooltip_text_label_color,
+                tooltip_text_color_value=scheme.tooltip_text_value_color,
+                body_background_color=scheme.body_background_color,
+                tag_pre_background_color=scheme.tag_pre_background_color,
+                headline_color=scheme.plot_title_text_color,
+                text_color=scheme.text_color,
+                )
+
+
 def generate_stylesheet(scheme, template="basic.css.j2") -> str:
-    env = Environment(loader=PackageLoader('backtrader_plotting.bokeh', 'templates'))
-    templ = env.get_template(template)
-
-    css = templ.render(dict(
-                             datatable_row_color_even=scheme.table_color_even,
-                             datatable_row_color_odd=scheme.table_color_odd,
-                             datatable_header_color=scheme.table_header_color,
-                             tab_active_background_color=scheme.tab_active_background_color,
-                             tab_active_color=scheme.tab_active_color,
-
-                             tooltip_background_color=scheme.tooltip_background_color,
-                             tooltip_text_color_label=scheme.tooltip_text_label_color,
-                             tooltip_text_color_value=scheme.tooltip_text_value_color,
-                             body_background_color=scheme.body_background_color,
-                             tag_pre_background_color=scheme.tag_pre_background_color,
-                             headline_color=scheme.plot_title_text_color,
-                             text_color=scheme.text_color,
-                           )
-                       )
+    templ = get_template(template)
+
+    css = templ.render(get_stylesheet_variables(scheme))
     return css
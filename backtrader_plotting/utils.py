@@ -1,10 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 import math
 from typing import Dict, Optional, List, Union
 
 import backtrader as bt
 
+import numpy
 import pandas
 import itertools
 
@@ -54,18 +55,20 @@ def resample_line(line, line_clk, new_clk):
     if new_clk is None:
         return line
 
-    new_line = []
-    next_idx = len(line_clk) - 1
-    for sc in new_clk:
-        for i in range(next_idx, 0, -1):
-            v = line_clk[-i]
-            if sc == v:
-                # exact hit
-                new_line.append(line[-i])
-                next_idx = i
-                break
-        else:
-            new_line.append(float('nan'))
+    line_clk = numpy.asarray(line_clk, dtype=numpy.float64)
+    new_clk = numpy.asarray(new_clk, dtype=numpy.float64)
+
+    new_line = numpy.full(len(new_clk), numpy.nan)
+    if len(line_clk) < 2:
+        return new_line
+
+    # clocks are sorted so all exact hits can be looked up at once. The first entry of line_clk is never matched
+    idx = numpy.searchsorted(line_clk[1:], new_clk) + 1
+    hit = idx < len(line_clk)
+    hit[hit] = line_clk[idx[hit]] == new_clk[hit]
+
+    # line and clock are aligned at their ends
+    new_line[hit] = numpy.asarray(line, dtype=numpy.float64)[idx[hit] - len(line_clk)]
     return new_line
 
 
@@ -83,10 +86,48 @@ def convert_to_pandas(strat_clk, obj: bt.LineSeries, start: datetime=None, end:
 
         df[name_prefix + linealias] = ndata
 
-    df[name_prefix + 'datetime'] = [bt.num2date(x) for x in strat_clk]
+    df[name_prefix + 'datetime'] = convert_to_datetime64(strat_clk)
     return df
 
 
+def _is_pandas_tz(tz) -> bool:
+    """Returns True if pandas converts to tz correctly. Other tzinfo implementations are taken as a fixed offset or fail"""
+    if isinstance(tz, timezone):
+        return True
+    return type(tz).__module__.split('.')[0] in ('pytz', 'dateutil', 'zoneinfo')
+
+
+def convert_to_datetime64(clk, tz=None) -> numpy.ndarray:
+    """Vectorized version of bt.num2date. Converts backtrader float dates to naive datetime64 values (local time of tz if given)"""
+    arr = numpy.asarray(clk, dtype=numpy.float64)
+
+    if tz is not None and not _is_pandas_tz(tz):
+        # arbitrary tzinfo objects (e.g. bt.utils.TZLocal) can only be applied per element
+        return numpy.array([bt.num2date(x, tz) for x in arr], dtype='datetime64[ns]')
+
+    days = arr.astype(numpy.int64)
+
+    # split the day fraction exactly like bt.num2date so that both produce identical values
+    hour, remainder = numpy.divmod(24.0 * (arr - days), 1)
+    minute, remainder = numpy.divmod(60.0 * remainder, 1)
+    second, remainder = numpy.divmod(60.0 * remainder, 1)
+    musecs = (1e6 * remainder).astype(numpy.int64)
+
+    # compensate for rounding errors the same way bt.num2date does
+    musecs[musecs < 10] = 0
+    musecs[musecs > 999990] = 1000000
+
+    musecs += ((hour * 60 + minute) * 60 + second).astype(numpy.int64) * 1000000
+
+    # backtrader dates are ordinals with day 1 being 0001-01-01 and day 719163 being the unix epoch
+    dt = (days - 719163).astype('datetime64[D]') + musecs.astype('timedelta64[us]')
+
+    if tz is not None:
+        # backtrader stores dates as UTC
+        dt = pandas.DatetimeIndex(dt).tz_localize('UTC').tz_convert(tz).tz_localize(None).values
+    return dt.astype('datetime64[ns]')
+
+
 def get_data_obj(obj):
     """obj can be a data object or just a single line (in case indicator was created with an explicit line)"""
     if obj._owner is not None:
@@ -40,6 +40,7 @@ setuptools.setup(
         'backtrader',
         'bokeh~=1.4.0',
         'jinja2',
+        'numpy',
         'pandas',
         'matplotlib',
         'markdown2',
@@ -81,6 +81,22 @@ def test_std_backtest(cerebro: bt.Cerebro):
     assert_num_figures(figs, 4)
 
 
+def test_std_backtest_xaxis_bottom(cerebro: bt.Cerebro):
+    cerebro.addstrategy(bt.strategies.MA_CrossOver)
+    cerebro.run()
+
+    s = backtrader_plotting.schemes.Blackly()
+    s.voloverlay = True  # no extra volume figures so all figures belong to the strategy
+    s.xaxis_pos = 'bottom'
+    b = Bokeh(style='bar', scheme=s, output_mode=_output_mode)
+    figs = cerebro.plot(b)
+
+    figures = figs[0][0].figures
+    assert len(figures) > 1
+    assert all(f.figure.xaxis.visible is False for f in figures[:-1])
+    assert figures[-1].figure.xaxis.visible is True
+
+
 def test_std_backtest_2datas(cerebro: bt.Cerebro):
     datapath = 'datas/nvda-1999-2014.txt'
     data = bt.feeds.YahooFinanceCSVData(
@@ -240,3 +256,43 @@ def test_ordered_optimize(cerebro: bt.Cerebro):
     num = count_children(model)
 
     assert num == 3
+
+
+def test_ordered_optimize_select(cerebro: bt.Cerebro):
+    cerebro.optstrategy(bt.strategies.MA_CrossOver, slow=[20], fast=[5, 10, 15])
+    res = cerebro.run(optreturn=True)
+
+    b = Bokeh(style='bar', output_mode=_output_mode)
+
+    # sort descending by parameter so table rows are in reverse order of the results
+    browser = OptBrowser(b, res, sortcolumn='fast', sortasc=False)
+    model = browser._build_optresult_model()
+
+    selector = model.children[0]
+    selector.source.selected.indices = [0]
+
+    assert b._figurepages[0].analyzers == [a for _, a in res[2][0].analyzers.getitems()]
+
+
+def test_stylesheet_follows_scheme_changes():
+    s = backtrader_plotting.schemes.Blackly()
+    b = Bokeh(scheme=s, output_mode=_output_mode)
+
+    s.table_header_color = '#123456'
+    assert '#123456' in b._output_stylesheet()
+
+    s.table_header_color = '#654321'
+    css = b._output_stylesheet()
+    assert '#654321' in css and '#123456' not in css
+
+
+def test_output_plot_file_failed_write(tmpdir, monkeypatch):
+    # a lone surrogate can not be encoded so writing fails after the temporary file was created
+    monkeypatch.setattr(backtrader_plotting.bokeh.bokeh, 'file_html', lambda *args, **kwargs: 'x' * (1 << 21) + '\ud800')
+
+    filename = str(tmpdir.join('plot.html'))
+    b = Bokeh(output_mode=_output_mode)
+    with pytest.raises(UnicodeEncodeError):
+        b._output_plot_file(None, 0, filename)
+
+    assert tmpdir.listdir() == []
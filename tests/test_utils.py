@@ -0,0 +1,96 @@
+import datetime
+
+import backtrader as bt
+import numpy
+import pytest
+
+from backtrader_plotting.utils import convert_to_datetime64, convert_to_pandas, resample_line
+
+
+class DstTimezone(datetime.tzinfo):
+    """Custom DST-aware timezone: UTC-4 from April to October, UTC-5 otherwise"""
+    def utcoffset(self, dt):
+        return datetime.timedelta(hours=-5) + self.dst(dt)
+
+    def dst(self, dt):
+        if dt is not None and 4 <= dt.month <= 10:
+            return datetime.timedelta(hours=1)
+        return datetime.timedelta(0)
+
+    def tzname(self, dt):
+        return 'DST'
+
+
+@pytest.fixture
+def intraday_clk():
+    start = datetime.datetime(2020, 1, 2, 9, 30)
+    return [bt.date2num(start + datetime.timedelta(minutes=5 * i)) for i in range(3000)]
+
+
+@pytest.mark.parametrize('tz', [None, datetime.timezone(datetime.timedelta(hours=2)), bt.utils.TZLocal, DstTimezone()])
+def test_convert_to_datetime64(intraday_clk, tz):
+    expected = numpy.array([bt.num2date(x, tz) for x in intraday_clk], dtype='datetime64[ns]')
+
+    converted = convert_to_datetime64(intraday_clk, tz)
+
+    assert converted.dtype == numpy.dtype('datetime64[ns]')
+    assert (converted == expected).all()
+
+
+def test_convert_to_datetime64_full_hour():
+    clk = [bt.date2num(datetime.datetime(2020, 1, 2, 10, 0))]
+    tz = datetime.timezone(datetime.timedelta(hours=2))
+
+    assert convert_to_datetime64(clk, tz)[0] == numpy.datetime64('2020-01-02T12:00:00')
+
+
+def test_convert_to_datetime64_custom_dst():
+    clk = [bt.date2num(datetime.datetime(2020, 1, 2, 12, 0)), bt.date2num(datetime.datetime(2020, 6, 1, 12, 0))]
+
+    converted = convert_to_datetime64(clk, DstTimezone())
+
+    numpy.testing.assert_array_equal(converted, numpy.array(['2020-01-02T07:00', '2020-06-01T08:00'], dtype='datetime64[ns]'))
+
+
+def test_convert_to_pandas_datetime():
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.YahooFinanceCSVData(
+        dataname='datas/orcl-1995-2014.txt',
+        fromdate=datetime.datetime(1998, 1, 1),
+        todate=datetime.datetime(1998, 12, 31),
+        reverse=False,
+        swapcloses=True,
+    ))
+    cerebro.addstrategy(bt.Strategy)
+    strategy = cerebro.run()[0]
+
+    data = strategy.datas[0]
+    strat_clk = numpy.frombuffer(strategy.lines.datetime.plotrange(0, len(strategy)))
+    df = convert_to_pandas(strat_clk, data, 0, len(strategy))
+
+    expected = numpy.array([bt.num2date(x) for x in strat_clk], dtype='datetime64[ns]')
+    assert (df.datetime.values == expected).all()
+
+
+def test_resample_line():
+    line = [10.0, 11.0, 12.0, 13.0]
+    line_clk = [1.0, 2.0, 3.0, 5.0]
+    new_clk = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+    resampled = resample_line(line, line_clk, new_clk)
+
+    # first entry of line_clk is never matched, 4.0 and 6.0 are misses
+    numpy.testing.assert_array_equal(resampled, [numpy.nan, 11.0, 12.0, numpy.nan, 13.0, numpy.nan])
+
+
+def test_resample_line_aligned_at_end():
+    # line and clock are matched from their ends
+    resampled = resample_line([11.0, 12.0], [1.0, 2.0, 3.0], [2.0, 3.0])
+
+    numpy.testing.assert_array_equal(resampled, [11.0, 12.0])
+
+
+def test_resample_line_no_new_clock():
+    line = [10.0, 11.0]
+
+    assert resample_line(line, [1.0, 2.0], None) is line